@@ -15,15 +15,23 @@ pyinstaller --onefile --windowed --icon=assets/img/icon.ico --add-data "assets/i
 import sys
 import os
 import time
+import mmap
+import tempfile
+import weakref
+import functools
+import operator
+from array import array
+from itertools import accumulate, repeat
 import ctypes
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-                           QLabel, QPushButton, QFileDialog, QTableWidget, QTableWidgetItem,
+                           QLabel, QPushButton, QFileDialog, QTableView,
                            QComboBox, QLineEdit, QMessageBox, QHeaderView, QFrame, QSplitter,
                            QStatusBar, QToolBar, QMenu, QDialog, QProgressDialog, QInputDialog,
-                           QProgressBar, QTextEdit, QStyledItemDelegate, QAbstractItemView, 
+                           QProgressBar, QPlainTextEdit, QStyledItemDelegate, QAbstractItemView, 
                            QScrollBar)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer, QThread, QObject, QModelIndex
-from PyQt6.QtGui import QAction, QIcon, QColor, QFont, QTextOption, QPixmap
+from PyQt6.QtCore import (Qt, QSize, pyqtSignal, QTimer, QThreadPool, QObject, QModelIndex,
+                          QAbstractTableModel, QSaveFile, QIODevice)
+from PyQt6.QtGui import QIcon, QColor, QFont, QTextOption, QPixmap, QStandardItemModel, QStandardItem
 
 
 # Define la ruta al icono de manera más robusta
@@ -42,18 +50,84 @@ def resource_path(relative_path):
 ICON_PATH = os.path.abspath(resource_path("assets/img/icon.ico"))
 
 
+@functools.cache
+def app_icon():
+    """Get the application icon, checked and loaded once for every window (None if the file is missing)"""
+    if os.path.exists(ICON_PATH):
+        return QIcon(ICON_PATH)
+    return None
+
+
+def open_save_file(path):
+    """Open a file for saving, it only replaces the original when commit_save_file is called"""
+    # Written to a temporary file that only replaces the original once complete, files in
+    # directories that cannot hold it (e.g. read-only ones) are written in place as before
+    save_file = QSaveFile(path)
+    save_file.setDirectWriteFallback(True)
+    if not save_file.open(QIODevice.OpenModeFlag.WriteOnly):
+        raise OSError(f"{save_file.fileName()}: {save_file.errorString()}")
+    return save_file
+
+
+def commit_save_file(save_file):
+    """Replace the original file with the written one"""
+    if not save_file.commit():
+        raise OSError(f"{save_file.fileName()}: {save_file.errorString()}")
+
+# Binary chunk size and stream buffer size used when loading files
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Lines joined per write when saving large files
+WRITE_BATCH_LINES = 65536
+
+# Files from this size on are mapped and decoded on demand instead of loaded into memory
+# (it must stay above zero, an empty file cannot be mapped)
+MAPPED_LOAD_THRESHOLD = 256 * 1024 * 1024
+
+# Files below this size are read directly, without a thread or progress dialog
+SYNC_LOAD_THRESHOLD = 2 * 1024 * 1024
+
+# Language options of the combos, code and name
+LANGUAGES = [
+    ("", "Select Language"),
+    ("es", "Spanish"),
+    ("en", "English"),
+    ("fr", "French"),
+    ("de", "German"),
+    ("it", "Italian"),
+    ("pt", "Portuguese"),
+    ("ru", "Russian"),
+    ("zh", "Chinese"),
+    ("ja", "Japanese"),
+    ("ko", "Korean"),
+    ("ar", "Arabic"),
+    ("other", "Other"),
+]
+
+# Minimum time in seconds between two progress signals of a worker
+PROGRESS_INTERVAL = 0.05
+
+# Item data roles that the table model answers
+DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+EDIT_ROLE = Qt.ItemDataRole.EditRole
+ALIGNMENT_ROLE = Qt.ItemDataRole.TextAlignmentRole
+FONT_ROLE = Qt.ItemDataRole.FontRole
+BACKGROUND_ROLE = Qt.ItemDataRole.BackgroundRole
+
+
 # Define the delegated class for first text edition
 class TextEditDelegate(QStyledItemDelegate):
-    """Personalized delegate that uses Qtextedit to edit multiline text in cells"""
+    """Personalized delegate that uses QPlainTextEdit to edit multiline text in cells"""
     def createEditor(self, parent, option, index):
-        editor = QTextEdit(parent)
-        editor.setAcceptRichText(False)
-        editor.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
+        # Plain text documents are much cheaper to lay out than QTextEdit rich text
+        editor = QPlainTextEdit(parent)
+        editor.setLineWrapMode(QPlainTextEdit.LineWrapMode.WidgetWidth)
         return editor
     
     def setEditorData(self, editor, index):
         value = index.model().data(index, Qt.ItemDataRole.DisplayRole)
-        editor.setText(value)
+        editor.setPlainText(value)
     
     def setModelData(self, editor, model, index):
         model.setData(index, editor.toPlainText(), Qt.ItemDataRole.EditRole)
@@ -62,30 +136,176 @@ class TextEditDelegate(QStyledItemDelegate):
         editor.setGeometry(option.rect)
 
 
-class LineNumberDelegate(QWidget):
-    """Custom widget for line numbers"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.layout = QVBoxLayout(self)
-        self.layout.setContentsMargins(5, 0, 5, 0)
-        self.layout.setSpacing(0)
-        
-        self.label = QLabel("0")
-        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        font = QFont()
-        font.setBold(True)
-        self.label.setFont(font)
+class MappedLines:
+    """List of lines of a large file, decoded on access from a memory-mapped private copy"""
+    def __init__(self, path, starts, ends):
+        # The mapped file is a private copy written by the loader, so the original file can be
+        # overwritten while it is being edited. Its lines are already indexed in starts and ends
+        self.path = path
+        with open(self.path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        # Byte range of every row in the mapping, a negative start points to edited_lines
+        self.starts = starts
+        self.ends = ends
+        self.edited_lines = []
+        
+        # Slots of edited_lines left by rows that were emptied or deleted, reused by the next edits
+        self.free_slots = []
+        
+        # Release the mapping and the copy when the content is discarded
+        self.finalizer = weakref.finalize(self, MappedLines.release, self.mm, self.path)
+    
+    @staticmethod
+    def createCopy(filepath):
+        """Create the empty private copy of a file, return it open for writing with its path"""
+        # The copy goes next to the source, on a disk that already holds the file. The
+        # temporary directory is often a RAM filesystem, which would defeat the mapping,
+        # so it is only used when the source directory cannot be written. The suffix keeps
+        # a copy left behind by a crash out of the text file filters
+        try:
+            fd, path = tempfile.mkstemp(prefix=".caniche-", suffix=".caniche-map",
+                                        dir=os.path.dirname(os.path.abspath(filepath)))
+        except OSError:
+            fd, path = tempfile.mkstemp(prefix=".caniche-", suffix=".caniche-map")
+        
+        # The leading dot only hides the copy on Unix
+        if sys.platform == 'win32':
+            try:
+                ctypes.windll.kernel32.SetFileAttributesW(path, 0x2)  # FILE_ATTRIBUTE_HIDDEN
+            except Exception:
+                pass
+        return os.fdopen(fd, 'wb'), path
+    
+    @staticmethod
+    def release(mm, path):
+        """Close the mapping and delete the private copy"""
+        if mm is not None:
+            mm.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def indexLines(chunk, offset, starts, ends):
+        """Index the lines of a chunk at an offset of the file, return its word count.
+        The chunk ends at a line break or at the end of the file"""
+        # Decode the chunk once here so an invalid file fails while loading, the rows
+        # are decoded again on access inside the model where an error cannot be reported.
+        # The decoded lines are counted while they are at hand
+        word_count = sum(map(len, map(str.split, chunk.decode('utf-8').split('\n'))))
+        
+        # Lines end at LF, CRLF or a lone CR like in text mode. Every CRLF keeps its CR as a
+        # placeholder byte so the lengths match the file, the CR is removed when the row is read
+        breaks = chunk.replace(b'\r\n', b'\0\n').replace(b'\r', b'\n')
+        lengths = list(map(len, breaks.split(b'\n')))
+        if breaks.endswith(b'\n'):
+            lengths.pop()
+        
+        # Line starts and ends are accumulated in C, no Python code runs per line
+        line_starts = list(accumulate(map(operator.add, lengths, repeat(1)), initial=offset))
+        line_starts.pop()
+        starts.extend(line_starts)
+        ends.extend(map(operator.add, line_starts, lengths))
+        return word_count
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        start = self.starts[index]
+        if start < 0:
+            return self.edited_lines[-start - 1]
+        return self.mm[start:self.ends[index]].decode('utf-8').removesuffix('\r')
+    
+    def __setitem__(self, index, value):
+        start = self.starts[index]
+        if value:
+            # A row edited again overwrites its own slot
+            if start < 0:
+                self.edited_lines[-start - 1] = value
+                return
+            
+            if self.free_slots:
+                slot = self.free_slots.pop()
+                self.edited_lines[slot] = value
+            else:
+                slot = len(self.edited_lines)
+                self.edited_lines.append(value)
+            self.starts[index] = -slot - 1
+        else:
+            # Empty lines need no storage, they are an empty range of the mapping
+            self.releaseSlot(start)
+            self.starts[index] = 0
+            self.ends[index] = 0
+    
+    def releaseSlot(self, start):
+        """Free the edited_lines slot that a row start points to, if any"""
+        if start < 0:
+            slot = -start - 1
+            self.edited_lines[slot] = None
+            self.free_slots.append(slot)
+    
+    def swap(self, index, other):
+        """Exchange two rows by their ranges, without decoding or copying the lines"""
+        self.starts[index], self.starts[other] = self.starts[other], self.starts[index]
+        self.ends[index], self.ends[other] = self.ends[other], self.ends[index]
+    
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+    
+    def append(self, value):
+        self.starts.append(0)
+        self.ends.append(0)
+        self[-1] = value
+    
+    def extend(self, values):
+        values = list(values)
+        if not any(values):
+            # Padding with empty lines, extend the ranges with zeros in C without a loop per row
+            zeros = bytes(self.starts.itemsize * len(values))
+            self.starts.frombytes(zeros)
+            self.ends.frombytes(zeros)
+            return
         
-        self.layout.addWidget(self.label)
+        for value in values:
+            self.append(value)
+    
+    def pop(self, index=-1):
+        value = self[index]
+        self.releaseSlot(self.starts[index])
+        del self.starts[index]
+        del self.ends[index]
+        return value
     
-    def setNumber(self, number):
-        self.label.setText(str(number))
+    def lower(self):
+        """Obtain a view of the lines in lowercase, computed on access"""
+        return LowercaseLines(self)
+
+
+class LowercaseLines:
+    """Read-only view that lowercases the lines of a MappedLines on access"""
+    def __init__(self, lines):
+        self.lines = lines
+    
+    def __len__(self):
+        return len(self.lines)
+    
+    def __getitem__(self, index):
+        return self.lines[index].lower()
+    
+    def __iter__(self):
+        return map(str.lower, self.lines)
 
 
 class FileLoaderWorker(QObject):
     """Working class to load files in a separate thread"""
-    progress_updated = pyqtSignal(int, int, float)  # loaded lines, total, percentage
-    finished = pyqtSignal(list)  # file content
+    progress_updated = pyqtSignal(int, int, float)  # bytes read, total bytes, percentage
+    finished = pyqtSignal(object, object)  # file content (a list or MappedLines), word count or None
     error = pyqtSignal(str)
     
     def __init__(self, filepath):
@@ -94,36 +314,192 @@ class FileLoaderWorker(QObject):
         self.is_canceled = False
     
     def load_file(self):
-        """Load the line file by line with progress update"""
+        """Load the file line by line with progress update"""
         try:
-            content = []
+            # Very large files are decoded on demand from a mapped copy.
+            # Words are counted chunk by chunk while the file is read, so the GUI never has to
+            if os.path.getsize(self.filepath) >= MAPPED_LOAD_THRESHOLD:
+                content, word_count = self.map_lines()
+            else:
+                content, word_count = self.read_lines()
+            
+            # Ownership of the content passes to the receiver, the worker never touches it again
+            if not self.is_canceled:
+                self.finished.emit(content, word_count)
+        
+        except Exception as e:
+            self.error.emit(str(e))
+    
+    @staticmethod
+    def line_break_cut(buf):
+        """Position after the last complete line of a buffer, the rest is carried to the next chunk"""
+        # A CR in the last byte may be the first half of a CRLF, it waits for the next chunk
+        return max(buf.rfind(b'\n'), buf.rfind(b'\r', 0, len(buf) - 1)) + 1
+    
+    def read_lines(self):
+        """Read and decode every line of the file into a list, return it with its word count"""
+        content = []
+        word_count = 0
+        
+        with open(self.filepath, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            # The file size is the progress denominator, so a single pass is enough
+            total_bytes = os.fstat(f.fileno()).st_size
+            
+            # Throttle progress signals so the GUI thread is not flooded
+            last_update = time.monotonic()
+            
+            # Partial line carried over from the previous chunk
+            tail = b''
+            while not self.is_canceled:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                # Split and decode every complete line of the chunk in bulk, with the
+                # line breaks of text mode (LF, CRLF and a lone CR)
+                buf = tail + chunk
+                cut = self.line_break_cut(buf)
+                tail = buf[cut:]
+                if cut:
+                    text = buf[:cut].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                    lines = text[:-1].split('\n')
+                    word_count += sum(map(len, map(str.split, lines)))
+                    content.extend(lines)
+                
+                # Update progress at most every PROGRESS_INTERVAL seconds
+                now = time.monotonic()
+                if now - last_update >= PROGRESS_INTERVAL:
+                    bytes_read = f.tell()
+                    percentage = bytes_read / total_bytes * 100
+                    self.progress_updated.emit(bytes_read, total_bytes, percentage)
+                    last_update = now
             
-            # First count the total number of lines
-            total_lines = 0
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                for _ in f:
-                    total_lines += 1
+            # Last line without a final line break
+            if tail and not self.is_canceled:
+                content.append(tail.decode('utf-8').removesuffix('\r'))
+                word_count += len(content[-1].split())
             
-            # Then read the content with progress updates
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                for i, line in enumerate(f):
-                    if self.is_canceled:
+            # Always report the end of the file
+            if total_bytes and not self.is_canceled:
+                self.progress_updated.emit(total_bytes, total_bytes, 100.0)
+        
+        return content, word_count
+    
+    def map_lines(self):
+        """Copy and index the lines of the file, return them mapped with its word count"""
+        starts = array('q')
+        ends = array('q')
+        word_count = 0
+        copy_file, copy_path = MappedLines.createCopy(self.filepath)
+        
+        try:
+            with copy_file, open(self.filepath, 'rb') as f:
+                total_bytes = os.fstat(f.fileno()).st_size
+                last_update = time.monotonic()
+                
+                # The copy is written in chunks, the complete lines of every chunk are indexed
+                # at the offset where they start. The partial line is carried over
+                offset = 0
+                tail = b''
+                while not self.is_canceled:
+                    chunk = f.read(READ_CHUNK_SIZE)
+                    if not chunk:
                         break
+                    copy_file.write(chunk)
                     
-                    content.append(line.rstrip('\n'))
+                    buf = tail + chunk
+                    cut = self.line_break_cut(buf)
+                    tail = buf[cut:]
+                    if cut:
+                        word_count += MappedLines.indexLines(buf[:cut], offset, starts, ends)
+                        offset += cut
                     
-                    # Update progress every 100 lines or on the last line
-                    if (i % 100 == 0) or (i == total_lines - 1):
-                        percentage = (i + 1) / total_lines * 100
-                        self.progress_updated.emit(i + 1, total_lines, percentage)
+                    # Update progress at most every PROGRESS_INTERVAL seconds
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_INTERVAL:
+                        bytes_read = f.tell()
+                        self.progress_updated.emit(bytes_read, total_bytes, bytes_read / total_bytes * 100)
+                        last_update = now
+                
+                # Last line without a final line break
+                if tail and not self.is_canceled:
+                    word_count += MappedLines.indexLines(tail, offset, starts, ends)
+            
+            if self.is_canceled:
+                MappedLines.release(None, copy_path)
+                return None, None
+            
+            content = MappedLines(copy_path, starts, ends)
+        except BaseException:
+            MappedLines.release(None, copy_path)
+            raise
+        
+        # Always report the end of the file
+        self.progress_updated.emit(total_bytes, total_bytes, 100.0)
+        
+        return content, word_count
+    
+    def cancel(self):
+        """Cancel the file loading"""
+        self.is_canceled = True
+
+
+class FileSaverWorker(QObject):
+    """Working class to save files in a separate thread"""
+    progress_updated = pyqtSignal(int)  # lines written
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+    
+    def __init__(self, filepath, content):
+        super().__init__()
+        self.filepath = filepath
+        self.content = content
+        self.is_canceled = False
+        self.is_saved = False
+    
+    def save_file(self):
+        """Write the lines in large binary batches with progress update"""
+        try:
+            total_lines = len(self.content)
+            separator = os.linesep.encode('utf-8')
+            
+            # Throttle progress signals so the GUI thread is not flooded
+            last_update = time.monotonic()
+            
+            save_file = open_save_file(self.filepath)
+            
+            for start in range(0, total_lines, WRITE_BATCH_LINES):
+                if self.is_canceled:
+                    # The original file is left untouched
+                    save_file.cancelWriting()
+                    return
+                
+                # Line break between batches, the file ends without one
+                if start:
+                    save_file.write(separator)
+                save_file.write(os.linesep.join(self.content[start:start + WRITE_BATCH_LINES]).encode('utf-8'))
+                
+                # Update progress at most every PROGRESS_INTERVAL seconds
+                now = time.monotonic()
+                if now - last_update >= PROGRESS_INTERVAL:
+                    self.progress_updated.emit(min(start + WRITE_BATCH_LINES, total_lines))
+                    last_update = now
+            
+            commit_save_file(save_file)
+            self.is_saved = True
             
-            self.finished.emit(content)
+            self.progress_updated.emit(total_lines)
+            self.finished.emit()
         
         except Exception as e:
             self.error.emit(str(e))
+        
+        finally:
+            # The content is the model's own list, it is released as soon as the file is written
+            self.content = None
     
     def cancel(self):
-        """Cancel the file loading"""
+        """Cancel the file saving"""
         self.is_canceled = True
 
 
@@ -136,8 +512,8 @@ class ProgressDialog(QDialog):
         self.setModal(True)
         
         # Establecer el ícono de la ventana
-        if os.path.exists(ICON_PATH):
-            self.setWindowIcon(QIcon(ICON_PATH))
+        if app_icon() is not None:
+            self.setWindowIcon(app_icon())
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -146,8 +522,8 @@ class ProgressDialog(QDialog):
         self.label = QLabel("Loading file ...")
         layout.addWidget(self.label)
         
-        # Tag to show processed/total lines
-        self.lines_label = QLabel("Processing lines: 0 / 0")
+        # Tag to show processed/total size
+        self.lines_label = QLabel("Processing: 0.0 / 0.0 MB")
         layout.addWidget(self.lines_label)
         
         # Progress bar
@@ -171,11 +547,19 @@ class ProgressDialog(QDialog):
         self.label.setText(text)
     
     def updateProgress(self, current, total, percentage):
-        """Update the progress bar and labels"""
-        self.lines_label.setText(f"Processing lines: {current:,} / {total:,}")
+        """Update the progress bar and labels from the bytes read so far"""
+        current_mb = current / (1024 * 1024)
+        total_mb = total / (1024 * 1024)
+        self.lines_label.setText(f"Processing: {current_mb:.1f} / {total_mb:.1f} MB")
+        self.progress_bar.setValue(int(percentage))
+        self.percentage_label.setText(f"{percentage:.2f}%")
+    
+    def updateLineProgress(self, current, total):
+        """Update the progress bar and labels from the lines written so far"""
+        percentage = current / total * 100 if total else 100.0
+        self.lines_label.setText(f"Processing: {current} / {total} lines")
         self.progress_bar.setValue(int(percentage))
         self.percentage_label.setText(f"{percentage:.2f}%")
-        QApplication.processEvents()  # Ensure that the UI is updated
     
     def closeEvent(self, event):
         """Ensure that dialogue is closed correctly"""
@@ -183,25 +567,381 @@ class ProgressDialog(QDialog):
         super().closeEvent(event)
 
 
-class VirtualTableWidget(QTableWidget):
-    """Virtual table widget with rows on demand"""
+class AlignerModel(QAbstractTableModel):
+    """Table model that serves both files from memory, the view only asks for visible cells"""
     rowModified = pyqtSignal(int)
     
+    # Shared values returned by data(), built once instead of for every painted cell
+    HIGHLIGHT_COLOR = QColor(255, 255, 160)  # Light yellow
+    MODIFIED_COLOR = QColor(225, 240, 255)  # Light blue
+    CONTENT_ALIGNMENT = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft
+    
+    # Translation tables that drop the modified bit of a column from every row at once
+    KEEP_OTHER_FLAG = {1: bytes(flags & ~1 for flags in range(256)),
+                       2: bytes(flags & ~2 for flags in range(256))}
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         # Complete data in memory
         self.file1_content = []
         self.file2_content = []
-        self.total_rows = 0
         
-        # Visualization configuration
-        self.visible_rows_buffer = 50  # Number of additional rows to load above and below
-        self.modified_rows = set()
+        # One byte per row with a bit per modified column (1 for file 1, 2 for file 2),
+        # deleting a row shifts the flags in C instead of rebuilding a set
+        self.modified_flags = bytearray()
+        
+        # Files (columns) with changes, the others do not need to be rewritten when saving
+        self.dirty_columns = set()
+        
+        # Word totals per file, counted once and then updated with the edits
+        self.word_counts = {1: None, 2: None}
+        
+        # Lowercase copies of the files, built on the first search
+        self.file1_lower = None
+        self.file2_lower = None
+        
+        # Rows that match the current search
+        self.highlighted_rows = set()
+        self.last_search_term = None
+        self.last_search_rows = set()
+        
+        self.header_labels = ["#", "File 1", "File 2"]
+        
+        # Line numbers share a single bold font
+        self.number_font = QFont()
+        self.number_font.setBold(True)
+    
+    def contentOf(self, column):
+        """Obtain the list of lines that backs a content column"""
+        if column == 1:
+            return self.file1_content
+        elif column == 2:
+            return self.file2_content
+        return []
+    
+    def lowerContentOf(self, column):
+        """Obtain the lowercase copy of a content column, built on first use"""
+        # Mapped files are lowercased on access, a full copy would defeat the mapping
+        content = self.contentOf(column)
+        if isinstance(content, MappedLines):
+            return content.lower()
+        
+        if column == 1:
+            if self.file1_lower is None:
+                self.file1_lower = [line.lower() for line in self.file1_content]
+            return self.file1_lower
+        elif column == 2:
+            if self.file2_lower is None:
+                self.file2_lower = [line.lower() for line in self.file2_content]
+            return self.file2_lower
+        return []
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(len(self.file1_content), len(self.file2_content))
+    
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 3  # Line number, file 1, file 2
+    
+    def data(self, index, role=DISPLAY_ROLE):
+        # Called for every role of every painted cell, so lookups are hoisted to module constants
+        row = index.row()
+        column = index.column()
+        if row < 0:
+            return None
+        
+        if role == DISPLAY_ROLE or role == EDIT_ROLE:
+            # Line number column
+            if column == 0:
+                return str(row + 1)
+            
+            # Content columns
+            content = self.file1_content if column == 1 else self.file2_content
+            return content[row] if row < len(content) else ""
+        if role == ALIGNMENT_ROLE:
+            return Qt.AlignmentFlag.AlignCenter if column == 0 else self.CONTENT_ALIGNMENT
+        if role == FONT_ROLE:
+            return self.number_font if column == 0 else None
+        if role == BACKGROUND_ROLE:
+            # Search results take precedence over the modified rows
+            if column > 0 and row in self.highlighted_rows:
+                return self.HIGHLIGHT_COLOR
+            if row < len(self.modified_flags) and self.modified_flags[row]:
+                return self.MODIFIED_COLOR
+        return None
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        # Just register changes in content columns (1 and 2)
+        if not index.isValid() or index.column() == 0 or role != Qt.ItemDataRole.EditRole:
+            return False
+        
+        row = index.row()
+        content = self.contentOf(index.column())
+        
+        # Pad the file if the edited row is past its end
+        if row >= len(content):
+            content.extend([""] * (row + 1 - len(content)))
+        
+        if content[row] == value:
+            return True
+        
+        # Update the word total with the difference of the edited line
+        column = index.column()
+        if self.word_counts[column] is not None:
+            self.word_counts[column] += len(value.split()) - len(content[row].split())
+        
+        # Update memory content
+        content[row] = value
+        self.markModified(row, column)
+        self.dirty_columns.add(column)
+        
+        # Keep the lowercase copy in sync if it was already built
+        lower = self.file1_lower if index.column() == 1 else self.file2_lower
+        if lower is not None:
+            if row >= len(lower):
+                lower.extend([""] * (row + 1 - len(lower)))
+            lower[row] = value.lower()
+        self.last_search_term = None
+        
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        self.rowModified.emit(row)
+        return True
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() > 0:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+    
+    def headerData(self, section, orientation, role=DISPLAY_ROLE):
+        # Answered here without falling back to the base class, the headers ask for several roles per section
+        if role != DISPLAY_ROLE:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.header_labels[section]
+        return str(section + 1)
+    
+    def setHeaderLabels(self, labels):
+        """Establish the texts of the horizontal header"""
+        # Loads and language changes often set the same texts again, the header is only repainted on a change
+        labels = list(labels)
+        if labels == self.header_labels:
+            return
+        self.header_labels = labels
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(self.header_labels) - 1)
+    
+    def setFileContent(self, column, content, word_count=None):
+        """Replace the content of a file, its word count is computed on demand when not given"""
+        other = self.file2_content if column == 1 else self.file1_content
+        old_rows = self.rowCount()
+        new_rows = max(len(content), len(other))
+        
+        # Only the difference in rows is inserted or removed, the view keeps the rest of its state
+        if new_rows > old_rows:
+            self.beginInsertRows(QModelIndex(), old_rows, new_rows - 1)
+        elif new_rows < old_rows:
+            self.beginRemoveRows(QModelIndex(), new_rows, old_rows - 1)
+        
+        # The model takes ownership of the list, it is not copied
+        self.dirty_columns.discard(column)
+        self.word_counts[column] = word_count
+        if column == 1:
+            self.file1_content = content
+            self.file1_lower = None
+        elif column == 2:
+            self.file2_content = content
+            self.file2_lower = None
+        self.last_search_term = None
+        
+        # The rows of the new file are not modified, the edits of the other file are kept
+        cleared_flags = self.modified_flags.translate(self.KEEP_OTHER_FLAG[column])
+        flags_changed = cleared_flags != self.modified_flags
+        self.modified_flags = cleared_flags
+        
+        if new_rows > old_rows:
+            self.endInsertRows()
+        elif new_rows < old_rows:
+            self.endRemoveRows()
+        
+        # A single change notification for the rows that were already shown
+        shown_rows = min(old_rows, new_rows)
+        if shown_rows > 0:
+            self.dataChanged.emit(self.index(0, column), self.index(shown_rows - 1, column),
+                                  [DISPLAY_ROLE, EDIT_ROLE])
+        if flags_changed and new_rows > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(new_rows - 1, 2), [BACKGROUND_ROLE])
+    
+    def clearContent(self):
+        """Remove the content of both files"""
+        self.beginResetModel()
+        self.file1_content = []
+        self.file2_content = []
+        self.file1_lower = None
+        self.file2_lower = None
+        self.modified_flags = bytearray()
+        self.dirty_columns.clear()
+        self.word_counts = {1: 0, 2: 0}
+        self.highlighted_rows = set()
+        self.last_search_term = None
+        self.endResetModel()
+    
+    def equalize(self):
+        """Extend the shortest file with empty lines"""
+        max_rows = self.rowCount()
+        
+        # The padded rows were already shown as empty, so the view needs no update.
+        # Each list is extended once from an iterator, without building a padding list first
+        for content in (self.file1_content, self.file2_content, self.file1_lower, self.file2_lower):
+            if content is not None and len(content) < max_rows:
+                content.extend(repeat("", max_rows - len(content)))
+    
+    def markModified(self, row, column):
+        """Flag a row of a file as modified"""
+        if row >= len(self.modified_flags):
+            self.modified_flags.extend(bytes(row + 1 - len(self.modified_flags)))
+        flags = self.modified_flags[row]
+        self.modified_flags[row] = flags | column
+        if flags:
+            return
+        
+        # Only the background of this row changes, and only when it was not modified yet
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 2), [BACKGROUND_ROLE])
+    
+    def modifiedCount(self):
+        """Count the modified rows"""
+        return len(self.modified_flags) - self.modified_flags.count(0)
+    
+    def clearModified(self):
+        """Forget the modifications, after saving the files"""
+        had_modified = self.modified_flags.count(0) != len(self.modified_flags)
+        self.modified_flags = bytearray()
+        self.dirty_columns.clear()
+        
+        # Repaint the rows that lose their modified background
+        if had_modified:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, 2), [BACKGROUND_ROLE])
+    
+    def countWords(self, column):
+        """Count the words of a file"""
+        if self.word_counts.get(column) is None:
+            # Split line by line in C instead of joining the whole file into one string
+            self.word_counts[column] = sum(map(len, map(str.split, self.contentOf(column))))
+        return self.word_counts[column]
+    
+    def swapRows(self, row_index, target_row):
+        """Exchange two adjacent rows"""
+        # Qt expects the destination as the position before which the row is inserted
+        destination = target_row + 1 if target_row > row_index else target_row
+        self.beginMoveRows(QModelIndex(), row_index, row_index, QModelIndex(), destination)
+        
+        for content in (self.file1_content, self.file2_content, self.file1_lower, self.file2_lower):
+            if content is None or row_index >= len(content) or target_row >= len(content):
+                continue
+            # Mapped rows exchange their ranges, assigning the lines would store them as edits
+            if isinstance(content, MappedLines):
+                content.swap(row_index, target_row)
+            else:
+                content[row_index], content[target_row] = content[target_row], content[row_index]
+        swapped_columns = [column for column in (1, 2)
+                           if max(row_index, target_row) < len(self.contentOf(column))]
+        self.dirty_columns.update(swapped_columns)
+        self.last_search_term = None
+        
+        self.endMoveRows()
+        
+        # Mark both rows as modified in the files that changed, rowModified is left to
+        # single cell edits so the caller refreshes once for the whole operation
+        for column in swapped_columns:
+            self.markModified(row_index, column)
+            self.markModified(target_row, column)
+    
+    def removeRowAt(self, row_index):
+        """Delete a row of both files"""
+        self.beginRemoveRows(QModelIndex(), row_index, row_index)
+        
+        # Remove the row of the memory
+        for column in (1, 2):
+            content = self.contentOf(column)
+            if row_index < len(content):
+                self.dirty_columns.add(column)
+                if self.word_counts[column] is not None:
+                    self.word_counts[column] -= len(content[row_index].split())
+        for content in (self.file1_content, self.file2_content, self.file1_lower, self.file2_lower):
+            if content is not None and row_index < len(content):
+                content.pop(row_index)
+        self.last_search_term = None
+        
+        # Update the modified rows
+        if row_index < len(self.modified_flags):
+            del self.modified_flags[row_index]
+        
+        # The highlighted rows below the deleted one move up with their content
+        self.highlighted_rows = {row - (row > row_index) for row in self.highlighted_rows if row != row_index}
+        
+        self.endRemoveRows()
+    
+    def appendEmptyRow(self):
+        """Add an empty line to the end of both files"""
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        for content in (self.file1_content, self.file2_content, self.file1_lower, self.file2_lower):
+            if content is not None:
+                content.append("")
+        self.dirty_columns.update((1, 2))
+        self.endInsertRows()
+        return self.rowCount() - 1
+    
+    def findRows(self, search_term):
+        """Find the rows where any of the files contains a lowercase search term"""
+        # Searching the same term again, the content has not changed since the last search
+        if search_term == self.last_search_term:
+            return self.last_search_rows
+        
+        if self.last_search_term is not None and self.last_search_term in search_term:
+            # A term that extends the previous one can only match a subset of its rows
+            lower1 = self.lowerContentOf(1)
+            lower2 = self.lowerContentOf(2)
+            rows = {i for i in self.last_search_rows
+                    if (i < len(lower1) and search_term in lower1[i])
+                    or (i < len(lower2) and search_term in lower2[i])}
+        else:
+            rows = {i for i, line in enumerate(self.lowerContentOf(1)) if search_term in line}
+            rows.update(i for i, line in enumerate(self.lowerContentOf(2)) if search_term in line)
+        
+        self.last_search_term = search_term
+        self.last_search_rows = rows
+        return rows
+    
+    def setHighlightedRows(self, rows):
+        """Establish the set of rows painted as search results"""
+        self.highlighted_rows = rows
+        if self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, 1), self.index(self.rowCount() - 1, 2),
+                                  [Qt.ItemDataRole.BackgroundRole])
+
+
+class VirtualTableWidget(QTableView):
+    """Virtual table view, the model only provides the rows that are painted"""
+    rowModified = pyqtSignal(int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
         
-        # Set the table
-        self.setColumnCount(3)  # Line number, file 1, file 2
-        self.setHorizontalHeaderLabels(["#", "File 1", "File 2"])
+        # Complete data in memory
+        self.aligner_model = AlignerModel(self)
+        self.setModel(self.aligner_model)
+        self.aligner_model.rowModified.connect(self.handleRowModified)
+        
+        # Visualization configuration
+        self.visible_rows_buffer = 50  # Number of additional rows to fit below the visible ones
+        self.fit_pending = False  # Visible rows waiting to be fitted after a column resize
         
         # Table settings
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
@@ -209,13 +949,14 @@ class VirtualTableWidget(QTableWidget):
         self.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.setColumnWidth(0, 50)
         
+        # Rows start at the height of a single line, which is what most rows are fitted to,
+        # so fitting them does not change the layout and rows never fitted do not look empty
+        self.verticalHeader().setDefaultSectionSize(self.verticalHeader().minimumSectionSize())
+        
         # Settings to display multiline text
         self.setWordWrap(True)
         self.horizontalHeader().setDefaultAlignment(Qt.AlignmentFlag.AlignLeft)
         
-        # Automatic rows height adjustment
-        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        
         # Configure the personalized editing delegate
         self.text_edit_delegate = TextEditDelegate()
         self.setItemDelegateForColumn(1, self.text_edit_delegate)
@@ -226,35 +967,51 @@ class VirtualTableWidget(QTableWidget):
                              QAbstractItemView.EditTrigger.SelectedClicked | 
                              QAbstractItemView.EditTrigger.EditKeyPressed)
         
-        # Allow direct editing in cells
-        self.cellChanged.connect(self.handleCellChange)
-        
-        # Connect Scroll signal
+        # Rows are fitted to their content only around the visible area, measuring
+        # every row of a large file (ResizeToContents) would defeat the virtual model.
+        # While scrolling just the visible rows are fitted, the buffer once the slider is released.
+        # Both stretched columns change width together, so their resizes are fitted once
         self.verticalScrollBar().valueChanged.connect(self.handleScroll)
-        
-        # Timer to optimize the load during scroll
-        self.scroll_timer = QTimer(self)
-        self.scroll_timer.setSingleShot(True)
-        self.scroll_timer.timeout.connect(self.loadVisibleRows)
+        self.verticalScrollBar().sliderReleased.connect(self.resizeVisibleRows)
+        self.horizontalHeader().sectionResized.connect(self.requestFit)
+        self.aligner_model.modelReset.connect(self.resizeVisibleRows)
     
-    def handleCellChange(self, row, column):
-        # Just register changes in content columns (1 and 2)
-        if column > 0:
-            self.modified_rows.add(row)
-            self.rowModified.emit(row)
-            
-            # Update memory content
-            if column == 1 and row < len(self.file1_content):
-                self.file1_content[row] = self.item(row, column).text()
-            elif column == 2 and row < len(self.file2_content):
-                self.file2_content[row] = self.item(row, column).text()
-            
-            # Automatically adjust the height of the row
+    @property
+    def file1_content(self):
+        return self.aligner_model.file1_content
+    
+    @property
+    def file2_content(self):
+        return self.aligner_model.file2_content
+    
+    @property
+    def total_rows(self):
+        return self.aligner_model.rowCount()
+    
+    def handleRowModified(self, row):
+        # Automatically adjust the height of the row
+        self.resizeRowToContents(row)
+        self.rowModified.emit(row)
+    
+    def handleScroll(self, *args):
+        # Fit only the strictly visible rows, the buffer is left for resizeVisibleRows
+        if self.total_rows == 0:
+            return
+        
+        first_visible, last_visible = self.visibleRowRange()
+        for row in range(first_visible, last_visible + 1):
             self.resizeRowToContents(row)
     
-    def handleScroll(self, value):
-        # Use a timer to avoid loading ranks during the fast scroll
-        self.scroll_timer.start(100)
+    def requestFit(self, *args):
+        """Schedule fitting the visible rows, repeated requests before it runs are merged into one"""
+        if not self.fit_pending:
+            self.fit_pending = True
+            QTimer.singleShot(0, self.fitPendingRows)
+    
+    def fitPendingRows(self):
+        """Fit the visible rows requested by requestFit"""
+        self.fit_pending = False
+        self.handleScroll()
     
     def visibleRowRange(self):
         """Obtain the rank of current rows"""
@@ -266,99 +1023,61 @@ class VirtualTableWidget(QTableWidget):
         if first_visible_row == -1:
             first_visible_row = 0
         if last_visible_row == -1:
-            if self.rowCount() > 0:
-                last_visible_row = self.rowCount() - 1
+            if self.total_rows > 0:
+                last_visible_row = self.total_rows - 1
             else:
                 last_visible_row = 0
         
         return first_visible_row, last_visible_row
     
-    def loadVisibleRows(self):
-        """Load the visible ranks and an additional buffer"""
+    def resizeVisibleRows(self):
+        """Fit the height of the visible rows and a buffer below them"""
         if self.total_rows == 0:
             return
         
-        # Obtain visible rows range
         first_visible, last_visible = self.visibleRowRange()
-        
-        # Calculate the ranks to load with buffer
-        start_row = max(0, first_visible - self.visible_rows_buffer)
         end_row = min(self.total_rows - 1, last_visible + self.visible_rows_buffer)
         
-        # Verify if there are rows that need to be created
-        current_rows = self.rowCount()
-        if end_row >= current_rows:
-            self.setRowCount(end_row + 1)
-            
-            # Create the necessary rows
-            for row in range(current_rows, end_row + 1):
-                # Just create the ranks, the content will be filled later
-                number_widget = LineNumberDelegate()
-                number_widget.setNumber(row + 1)
-                self.setCellWidget(row, 0, number_widget)
-        
-        # Load content for visible ranks and buffer
-        self.loadContentForRows(start_row, end_row)
-    
-    def loadContentForRows(self, start_row, end_row):
-        """Load the content for a specific range of rows"""
-        for row in range(start_row, end_row + 1):
-            # Verify if the cells are already created and have content
-            for col in range(1, 3):
-                item = self.item(row, col)
-                
-                # If the item does not exist, create it with the corresponding content
-                if item is None:
-                    content = ""
-                    if col == 1 and row < len(self.file1_content):
-                        content = self.file1_content[row]
-                    elif col == 2 and row < len(self.file2_content):
-                        content = self.file2_content[row]
-                    
-                    item = self.createCustomTableItem(content)
-                    self.setItem(row, col, item)
-                # If the item exists but it is empty and should have content, update it
-                elif item.text() == "":
-                    if col == 1 and row < len(self.file1_content) and self.file1_content[row] != "":
-                        item.setText(self.file1_content[row])
-                    elif col == 2 and row < len(self.file2_content) and self.file2_content[row] != "":
-                        item.setText(self.file2_content[row])
-    
-    def createCustomTableItem(self, text=""):
-        """Create an item of table with multiline text configuration"""
-        item = QTableWidgetItem(text)
-        item.setTextAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-        return item
-    
-    def setContentFromFile(self, column, content):
+        for row in range(first_visible, end_row + 1):
+            self.resizeRowToContents(row)
+    
+    def setHorizontalHeaderLabels(self, labels):
+        """Establish the texts of the horizontal header"""
+        self.aligner_model.setHeaderLabels(labels)
+    
+    def modifiedCount(self):
+        """Count the modified rows"""
+        return self.aligner_model.modifiedCount()
+    
+    def isColumnModified(self, column):
+        """Check if a file has changes that are not saved"""
+        return column in self.aligner_model.dirty_columns
+    
+    def writeColumn(self, column, path):
+        """Write the content of a file with a single write"""
+        content = self.aligner_model.contentOf(column)
+        
+        # Join and encode in C, the platform line separator keeps the text mode output
+        save_file = open_save_file(path)
+        save_file.write(os.linesep.join(content).encode('utf-8'))
+        commit_save_file(save_file)
+    
+    def clearModified(self):
+        """Forget the modifications, after saving the files"""
+        self.aligner_model.clearModified()
+    
+    def setContentFromFile(self, column, content, word_count=None):
         """Establish the content of a memory file"""
-        if column == 1:
-            self.file1_content = content.copy()
-        elif column == 2:
-            self.file2_content = content.copy()
-        
-        # Update the total rows
-        self.total_rows = max(len(self.file1_content), len(self.file2_content))
-        
-        # Load visible initial rows
-        self.loadVisibleRows()
-        
-        # Force an immediate and complete update for visible rows
-        QTimer.singleShot(100, self.forceVisibleUpdate)
+        self.aligner_model.setFileContent(column, content, word_count)
+        self.resizeVisibleRows()
+    
+    def clearContent(self):
+        """Remove the content of both files"""
+        self.aligner_model.clearContent()
     
     def equalizeFiles(self):
         """Match the content of both files so that they have the same number of lines"""
-        max_rows = self.total_rows
-        
-        # Extend the shortest file with empty lines
-        if len(self.file1_content) < max_rows:
-            self.file1_content.extend([""] * (max_rows - len(self.file1_content)))
-        
-        if len(self.file2_content) < max_rows:
-            self.file2_content.extend([""] * (max_rows - len(self.file2_content)))
-        
-        # Force update after matching
-        QTimer.singleShot(100, self.forceVisibleUpdate)
+        self.aligner_model.equalize()
     
     def moveRow(self, row_index, direction):
         """Move a row up or down"""
@@ -368,34 +1087,7 @@ class VirtualTableWidget(QTableWidget):
         if target_row < 0 or target_row >= self.total_rows:
             return False
         
-        # Exchange content in memory
-        # File 1
-        if row_index < len(self.file1_content) and target_row < len(self.file1_content):
-            self.file1_content[row_index], self.file1_content[target_row] = \
-                self.file1_content[target_row], self.file1_content[row_index]
-        
-        # File 2
-        if row_index < len(self.file2_content) and target_row < len(self.file2_content):
-            self.file2_content[row_index], self.file2_content[target_row] = \
-                self.file2_content[target_row], self.file2_content[row_index]
-        
-        # Exchange content of visible cells
-        for col in range(1, self.columnCount()):
-            current_item = self.item(row_index, col)
-            target_item = self.item(target_row, col)
-            
-            if current_item and target_item:
-                current_text = current_item.text()
-                target_text = target_item.text()
-                
-                current_item.setText(target_text)
-                target_item.setText(current_text)
-        
-        # Mark both rows as modified
-        self.modified_rows.add(row_index)
-        self.modified_rows.add(target_row)
-        self.rowModified.emit(row_index)
-        self.rowModified.emit(target_row)
+        self.aligner_model.swapRows(row_index, target_row)
         
         # Adjust rows height
         self.resizeRowToContents(row_index)
@@ -411,200 +1103,88 @@ class VirtualTableWidget(QTableWidget):
         if row_index < 0 or row_index >= self.total_rows:
             return False
         
-        # Remove the row of the memory
-        if row_index < len(self.file1_content):
-            self.file1_content.pop(row_index)
-        
-        if row_index < len(self.file2_content):
-            self.file2_content.pop(row_index)
-        
-        # Update the total rows
-        self.total_rows -= 1
-        
-        # Delete the row from the table
-        self.removeRow(row_index)
-        
-        # Update the modified rows
-        new_modified_rows = set()
-        for index in self.modified_rows:
-            if index < row_index:
-                new_modified_rows.add(index)
-            elif index > row_index:
-                new_modified_rows.add(index - 1)
-        
-        self.modified_rows = new_modified_rows
-        
-        # Update the line numbers
-        self.updateNumberColumn()
+        self.aligner_model.removeRowAt(row_index)
         
         return True
     
     def addEmptyRow(self):
         """Add an empty row to the end"""
-        # Add an empty line to memory data
-        self.file1_content.append("")
-        self.file2_content.append("")
+        new_row = self.aligner_model.appendEmptyRow()
         
-        # Update the total rows
-        self.total_rows += 1
+        # Adjust height automatically and select the new row
+        self.resizeRowToContents(new_row)
+        self.selectRow(new_row)
         
-        # Verify if the new row is within the visible range
-        first_visible, last_visible = self.visibleRowRange()
-        if self.total_rows - 1 <= last_visible + self.visible_rows_buffer:
-            # Add the row to the table
-            row_count = self.rowCount()
-            self.insertRow(row_count)
-            
-            # Add line number
-            number_widget = LineNumberDelegate()
-            number_widget.setNumber(row_count + 1)
-            self.setCellWidget(row_count, 0, number_widget)
-            
-            # Add empty editable cells
-            self.setItem(row_count, 1, self.createCustomTableItem(""))
-            self.setItem(row_count, 2, self.createCustomTableItem(""))
-            
-            # Adjust height automatically
-            self.resizeRowToContents(row_count)
-            
-            # Select the new row
-            self.selectRow(row_count)
-        
-        return self.total_rows - 1  # Return the index of the new row
+        return new_row  # Return the index of the new row
     
     def getContent(self, column):
         """Obtain the content of a specific column as a list of lines"""
-        if column == 1:
-            return self.file1_content.copy()
-        elif column == 2:
-            return self.file2_content.copy()
-        return []
+        # The list is the one held by the model, callers that modify it must copy it first
+        return self.aligner_model.contentOf(column)
     
-    def forceVisibleUpdate(self):
-        """Force the update of all visible cells"""
-        first_visible, last_visible = self.visibleRowRange()
-        
-        # Walk all visible ranks
-        for row in range(first_visible, last_visible + 1):
-            if row < self.rowCount():
-                # Update the cells in columns 1 and 2
-                for col in range(1, 3):
-                    item = self.item(row, col)
-                    if item:
-                        # Get the right content
-                        content = ""
-                        if col == 1 and row < len(self.file1_content):
-                            content = self.file1_content[row]
-                        elif col == 2 and row < len(self.file2_content):
-                            content = self.file2_content[row]
-                            
-                        # Update the content
-                        if item.text() != content:
-                            item.setText(content)
-        
-        # Necessary to force repainting
-        self.viewport().update()
-        QApplication.processEvents()
-        
     def highlightSearchResults(self, search_term):
         """Highlight the rows that contain the search term"""
         if not search_term:
             # If the search term is empty, clean all those highlighted
-            for row in range(self.rowCount()):
-                for col in range(1, self.columnCount()):
-                    item = self.item(row, col)
-                    if item:
-                        item.setBackground(QColor(255, 255, 255))
+            self.aligner_model.setHighlightedRows(set())
             return 0
         
         search_term = search_term.lower()
-        matches = 0
-        
-        # Search in memory data
-        matching_rows = []
-        
-        # Search in the content of file 1
-        for i, line in enumerate(self.file1_content):
-            if search_term in line.lower():
-                matching_rows.append(i)
-                matches += 1
-        
-        # Search in the content of file 2
-        for i, line in enumerate(self.file2_content):
-            if i not in matching_rows and search_term in line.lower():
-                matching_rows.append(i)
-                matches += 1
-        
-        # Highlight the visible rows that coincide
-        for row in range(self.rowCount()):
-            if row in matching_rows:
-                for col in range(1, self.columnCount()):
-                    item = self.item(row, col)
-                    if item:
-                        item.setBackground(QColor(255, 255, 160))  # Light yellow
-            else:
-                for col in range(1, self.columnCount()):
-                    item = self.item(row, col)
-                    if item:
-                        item.setBackground(QColor(255, 255, 255))  # White
-        
-        # If there are coincidences that are not visible, make sure to load at least the first
-        if matching_rows and not any(row < self.rowCount() for row in matching_rows):
-            # Scroll to the first coincidence
-            first_match = min(matching_rows)
-            self.setCurrentCell(first_match, 1)
-            
-            # Load rows around the first coincidence
-            self.loadContentForRows(max(0, first_match - self.visible_rows_buffer), 
-                                   min(self.total_rows - 1, first_match + self.visible_rows_buffer))
-            
-            # Highlight the first coincidence
-            for col in range(1, self.columnCount()):
-                item = self.item(first_match, col)
-                if item:
-                    item.setBackground(QColor(255, 255, 160))  # Amarillo claro
+        
+        # Search in memory data, a set keeps the lookups of the model O(1) per painted row
+        matching_rows = self.aligner_model.findRows(search_term)
+        matches = len(matching_rows)
+        
+        # The model paints the matching rows when they become visible
+        self.aligner_model.setHighlightedRows(matching_rows)
+        
+        # If there are coincidences but none is visible, scroll to the first one
+        if matching_rows:
+            first_visible, last_visible = self.visibleRowRange()
+            if not any(row in matching_rows for row in range(first_visible, last_visible + 1)):
+                first_match = min(matching_rows)
+                index = self.aligner_model.index(first_match, 1)
+                self.setCurrentIndex(index)
+                self.scrollTo(index)
         
         return matches
     
     def countWords(self, column):
         """Count words in the specified column"""   
-        content = []
-        if column == 1:
-            content = self.file1_content
-        elif column == 2:
-            content = self.file2_content
-        
-        words = ' '.join(content).split()
-        return len(words)
-    
-    def updateNumberColumn(self):
-        """Update the line numbers"""
-        for row in range(self.rowCount()):
-            number_widget = self.cellWidget(row, 0)
-            if not number_widget:
-                number_widget = LineNumberDelegate()
-                self.setCellWidget(row, 0, number_widget)
-            number_widget.setNumber(row + 1)
+        return self.aligner_model.countWords(column)
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
+    # Language options shared by the combos, built with the first one
+    language_model = None
+    
     def __init__(self):
         super().__init__()
         
         self.file1_path = ""
         self.file2_path = ""
+        self.file1_name = ""  # File names of the paths, kept for headers and messages
+        self.file2_name = ""
         self.file1_language = ""
         self.file2_language = ""
         
         # Establecer el ícono de la aplicación para la ventana principal
-        if os.path.exists(ICON_PATH):
-            self.setWindowIcon(QIcon(ICON_PATH))
+        if app_icon() is not None:
+            self.setWindowIcon(app_icon())
         
-        # Referencias to threads and working objects
-        self.file_loader_thread = None
+        # Referencias to threads and working objects, a single kept-alive thread runs every load and save
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.thread_pool.setExpiryTimeout(-1)
         self.file_loader = None
         
+        # Statistics and status message requested since the last refresh, both are applied
+        # together once per event loop pass
+        self.stats_pending = False
+        self.pending_status = None
+        self.refresh_scheduled = False
+        
         self.setupUi()
         self.connectSignals()
     
@@ -720,11 +1300,12 @@ class MainWindow(QMainWindow):
         
         # Edition table with virtual load
         self.table = VirtualTableWidget()
-        self.table.rowModified.connect(self.updateStats)
+        self.table.rowModified.connect(self.requestStats)
         
         # Assign context menu to the table
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.showTableContextMenu)
+        self.setupContextMenu()
         
         main_layout.addWidget(self.table)
         
@@ -786,24 +1367,15 @@ class MainWindow(QMainWindow):
     
     def setupLanguageCombo(self, combo):
         """Configure language options in combobox"""
-        languages = [
-            ("", "Select Language"),
-            ("es", "Spanish"),
-            ("en", "English"),
-            ("fr", "French"),
-            ("de", "German"),
-            ("it", "Italian"),
-            ("pt", "Portuguese"),
-            ("ru", "Russian"),
-            ("zh", "Chinese"),
-            ("ja", "Japanese"),
-            ("ko", "Korean"),
-            ("ar", "Arabic"),
-            ("other", "Other"),
-        ]
-        
-        for code, name in languages:
-            combo.addItem(name, code)
+        # Both combos share one model, its items are built only once
+        if MainWindow.language_model is None:
+            MainWindow.language_model = QStandardItemModel()
+            for code, name in LANGUAGES:
+                item = QStandardItem(name)
+                item.setData(code, Qt.ItemDataRole.UserRole)
+                MainWindow.language_model.appendRow(item)
+        
+        combo.setModel(MainWindow.language_model)
     
     def connectSignals(self):
         """Connect signals and slots"""
@@ -820,80 +1392,91 @@ class MainWindow(QMainWindow):
         )
         
         if filepath:
-            if file_num == 1:
-                self.file1_path = filepath
-                self.file1_path_label.setText(filepath)
-                self.loadFile(1, filepath)
-            else:
-                self.file2_path = filepath
-                self.file2_path_label.setText(filepath)
-                self.loadFile(2, filepath)
+            # The path is only taken once the file is loaded, so a canceled load keeps the previous file
+            self.loadFile(file_num, filepath)
     
     def loadFile(self, file_num, filepath):
         """Load the content of a file using a separate thread with progress bar"""
         try:
-            # Create the file load thread
-            self.file_loader_thread = QThread()
+            # Small files load in a few milliseconds, the dialog would only flash
+            if os.path.getsize(filepath) < SYNC_LOAD_THRESHOLD:
+                loader = FileLoaderWorker(filepath)
+                loader.finished.connect(
+                    lambda content, word_count: self.fileLoadFinished(file_num, filepath, content, word_count))
+                loader.error.connect(self.fileLoadError)
+                loader.load_file()
+                return
+            
+            # Create the file load worker, it runs in the thread pool
             self.file_loader = FileLoaderWorker(filepath)
-            self.file_loader.moveToThread(self.file_loader_thread)
             
             # Configure the progress dialog
             progress_dialog = ProgressDialog(self)
             progress_dialog.setWindowTitle(f"Loading file {file_num}")
             progress_dialog.setLabelText(f"Loading {os.path.basename(filepath)}")
             
-            # Connect signals
-            self.file_loader.progress_updated.connect(progress_dialog.updateProgress)
-            self.file_loader.finished.connect(lambda content: self.fileLoadFinished(file_num, filepath, content))
-            self.file_loader.finished.connect(self.file_loader_thread.quit)
-            self.file_loader.finished.connect(lambda: progress_dialog.accept())
-            self.file_loader.error.connect(lambda error: self.fileLoadError(error, progress_dialog))
-            self.file_loader_thread.started.connect(self.file_loader.load_file)
+            # Connect signals, queued so the slots run on the GUI thread while the worker keeps reading
+            queued = Qt.ConnectionType.QueuedConnection
+            self.file_loader.progress_updated.connect(progress_dialog.updateProgress, queued)
+            self.file_loader.finished.connect(
+                lambda content, word_count: self.fileLoadFinished(file_num, filepath, content, word_count), queued)
+            self.file_loader.finished.connect(lambda: progress_dialog.accept(), queued)
+            self.file_loader.error.connect(lambda error: self.fileLoadError(error, progress_dialog), queued)
+            
+            # Cancel directly, the worker thread is busy reading and would never run a queued slot
+            progress_dialog.rejected.connect(self.file_loader.cancel, Qt.ConnectionType.DirectConnection)
             
-            # Start the thread and show the dialogue
-            self.file_loader_thread.start()
+            # Start the load and show the dialogue
+            self.thread_pool.start(self.file_loader.load_file)
             
             # Execute the dialogue
             progress_dialog.exec()
             
-            # Clean resources
-            self.file_loader_thread.quit()
-            self.file_loader_thread.wait()
+            # Wait for a canceled load to stop reading
+            self.thread_pool.waitForDone()
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"The file load could not be started: {str(e)}")
     
-    def fileLoadFinished(self, file_num, filepath, content):
+    def fileLoadFinished(self, file_num, filepath, content, word_count=None):
         """Process the loaded file content"""
         try:
+            if file_num == 1:
+                self.file1_path = filepath
+                self.file1_name = os.path.basename(filepath)
+                self.file1_path_label.setText(filepath)
+            else:
+                self.file2_path = filepath
+                self.file2_name = os.path.basename(filepath)
+                self.file2_path_label.setText(filepath)
+            
             # Stablish the content in the table
-            self.table.setContentFromFile(file_num, content)
+            self.table.setContentFromFile(file_num, content, word_count)
             
             # If both files are loaded, make sure they have the same number of rows
             if self.file1_path and self.file2_path:
                 self.table.equalizeFiles()
-                
-            # Force an additional update after a brief delay
-            QTimer.singleShot(200, self.table.forceVisibleUpdate)
             
             self.updateTableHeaders()
-            self.updateStats()
-            self.showStatusMessage(f"File {file_num} loaded: {os.path.basename(filepath)}")
+            self.requestStats()
+            file_name = self.file1_name if file_num == 1 else self.file2_name
+            self.showStatusMessage(f"File {file_num} loaded: {file_name}")
         
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error when processing the loaded file: {str(e)}")
     
-    def fileLoadError(self, error, progress_dialog):
+    def fileLoadError(self, error, progress_dialog=None):
         """Handle errors during file load"""
-        progress_dialog.reject()
-        progress_dialog.close()
-        progress_dialog.deleteLater()
+        if progress_dialog is not None:
+            progress_dialog.reject()
+            progress_dialog.close()
+            progress_dialog.deleteLater()
         QMessageBox.critical(self, "Error", f"The file could not be loaded: {str(error)}")
     
     def updateTableHeaders(self):
         """Update the table headers according to the selected languages"""
-        file1_name = os.path.basename(self.file1_path) if self.file1_path else "File 1"
-        file2_name = os.path.basename(self.file2_path) if self.file2_path else "File 2"
+        file1_name = self.file1_name or "File 1"
+        file2_name = self.file2_name or "File 2"
         
         # Obtain the texts of the selected languages
         lang1_idx = self.language1_combo.currentIndex()
@@ -915,42 +1498,47 @@ class MainWindow(QMainWindow):
         
         self.table.setHorizontalHeaderLabels(["#", file1_name, file2_name])
     
-    def showTableContextMenu(self, position):
-        """Show the context menu in the table"""
-        menu = QMenu()
+    def setupContextMenu(self):
+        """Build the context menu of the table once, its actions act on the row it was opened on"""
+        self.context_menu = QMenu(self)
+        self.context_menu_row = -1
         
         # Establecer el ícono al menú de contexto
-        if os.path.exists(ICON_PATH):
-            menu.setWindowIcon(QIcon(ICON_PATH))
+        if app_icon() is not None:
+            self.context_menu.setWindowIcon(app_icon())
         
-        row = self.table.rowAt(position.y())
-        if row >= 0:
-            move_up_action = QAction("Move up", self)
-            move_up_action.triggered.connect(lambda: self.moveRow(row, 'up'))
-            menu.addAction(move_up_action)
-            
-            move_down_action = QAction("Move down", self)
-            move_down_action.triggered.connect(lambda: self.moveRow(row, 'down'))
-            menu.addAction(move_down_action)
-            
-            menu.addSeparator()
-            
-            delete_action = QAction("Remove row", self)
-            delete_action.triggered.connect(lambda: self.deleteRow(row))
-            menu.addAction(delete_action)
+        self.move_up_action = self.context_menu.addAction("Move up")
+        self.move_up_action.triggered.connect(lambda: self.moveRow(self.context_menu_row, 'up'))
+        
+        self.move_down_action = self.context_menu.addAction("Move down")
+        self.move_down_action.triggered.connect(lambda: self.moveRow(self.context_menu_row, 'down'))
+        
+        self.context_menu_separator = self.context_menu.addSeparator()
+        
+        self.delete_action = self.context_menu.addAction("Remove row")
+        self.delete_action.triggered.connect(lambda: self.deleteRow(self.context_menu_row))
         
-        add_action = QAction("Add row", self)
+        add_action = self.context_menu.addAction("Add row")
         add_action.triggered.connect(self.addRow)
-        menu.addAction(add_action)
+    
+    def showTableContextMenu(self, position):
+        """Show the context menu in the table"""
+        # The row actions are only offered over a row
+        row = self.table.rowAt(position.y())
+        self.context_menu_row = row
+        for action in (self.move_up_action, self.move_down_action,
+                       self.context_menu_separator, self.delete_action):
+            action.setVisible(row >= 0)
         
-        menu.exec(self.table.mapToGlobal(position))
+        # The position is relative to the viewport, below the header
+        self.context_menu.exec(self.table.viewport().mapToGlobal(position))
     
     def moveRow(self, row_index, direction):
         """Move a row up or down"""
         if self.table.moveRow(row_index, direction):
             direction_text = "up" if direction == 'up' else "down"
             self.showStatusMessage(f"Row moved to {direction_text}")
-            self.updateStats()
+            self.requestStats()
     
     def deleteRow(self, row_index):
         """Delete a row"""
@@ -962,17 +1550,16 @@ class MainWindow(QMainWindow):
         if confirm == QMessageBox.StandardButton.Yes:
             if self.table.deleteRow(row_index):
                 self.showStatusMessage("Row deleted")
-                self.updateStats()
+                self.requestStats()
     
     def addRow(self):
         """Add a new row at the end of the table"""
         new_row = self.table.addEmptyRow()
         self.showStatusMessage("New line added")
-        self.updateStats()
+        self.requestStats()
         
         # Make sure the new row is visible
-        if new_row < self.table.rowCount():
-            self.table.scrollToItem(self.table.item(new_row, 1))
+        self.table.scrollTo(self.table.model().index(new_row, 1))
     
     def saveChanges(self):
         """Save changes in original files with progress bar"""
@@ -981,12 +1568,17 @@ class MainWindow(QMainWindow):
             return
         
         try:
+            # Files without changes are not rewritten
             files_to_save = []
-            if self.file1_path:
+            if self.file1_path and self.table.isColumnModified(1):
                 files_to_save.append((self.file1_path, 1))
-            if self.file2_path:
+            if self.file2_path and self.table.isColumnModified(2):
                 files_to_save.append((self.file2_path, 2))
             
+            if not files_to_save:
+                QMessageBox.information(self, "Information", "There are no changes to save.")
+                return
+            
             # Create a progress bar
             total_files = len(files_to_save)
             progress = QProgressDialog("Saving files ...", "Cancel", 0, total_files, self)
@@ -994,8 +1586,8 @@ class MainWindow(QMainWindow):
             progress.setWindowModality(Qt.WindowModality.WindowModal)
             
             # Establecer el ícono para el diálogo de progreso
-            if os.path.exists(ICON_PATH):
-                progress.setWindowIcon(QIcon(ICON_PATH))
+            if app_icon() is not None:
+                progress.setWindowIcon(app_icon())
             
             saved_files = []
             
@@ -1006,44 +1598,15 @@ class MainWindow(QMainWindow):
                 if progress.wasCanceled():
                     break
                 
-                content = self.table.getContent(column)
-                total_lines = len(content)
+                total_lines = len(self.table.getContent(column))
                 
-                # If the file is large, show detailed progress
+                # If the file is large, write it from a thread with detailed progress
                 if total_lines > 10000:
-                    save_progress = QProgressDialog(
-                        f"Saving {os.path.basename(file_path)}...", 
-                        "Cancel", 0, total_lines, self)
-                    save_progress.setWindowTitle(f"Saving {os.path.basename(file_path)}")
-                    save_progress.setWindowModality(Qt.WindowModality.WindowModal)
-                    
-                    # Establecer ícono para el diálogo de progreso
-                    if os.path.exists(ICON_PATH):
-                        save_progress.setWindowIcon(QIcon(ICON_PATH))
-                    
-                    # Write lines in batch for better performance and update progress
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        batch_size = 1000
-                        for j in range(0, total_lines, batch_size):
-                            if save_progress.wasCanceled():
-                                # If it is canceled, close the file and exit
-                                break
-                            
-                            end_idx = min(j + batch_size, total_lines)
-                            f.write('\n'.join(content[j:end_idx]))
-                            if j + batch_size < total_lines:
-                                f.write('\n')  # Add line jump between batches
-                            
-                            save_progress.setValue(end_idx)
-                            QApplication.processEvents()
-                    
-                    save_progress.setValue(total_lines)
-                    save_progress.close()
-                    save_progress.deleteLater()
+                    if not self.saveFileInThread(column, file_path):
+                        break
                 else:
                     # For small files, save directly
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(content))
+                    self.table.writeColumn(column, file_path)
                 
                 saved_files.append(os.path.basename(file_path))
             
@@ -1051,9 +1614,14 @@ class MainWindow(QMainWindow):
             progress.close()
             progress.deleteLater()
             
+            # A canceled save keeps the modifications, the remaining files were not written
+            if len(saved_files) < total_files:
+                self.showStatusMessage("Save canceled")
+                return
+            
             # Clean the set of modified rows
-            self.table.modified_rows.clear()
-            self.updateStats()
+            self.table.clearModified()
+            self.requestStats()
             
             # Success message
             files_str = " y ".join(saved_files)
@@ -1063,6 +1631,47 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error saving the changes: {str(e)}")
     
+    def saveFileInThread(self, column, file_path):
+        """Write a file from a separate thread with progress bar, return whether it was completed"""
+        content = self.table.getContent(column)
+        total_lines = len(content)
+        file_name = os.path.basename(file_path)
+        
+        # Create the file save worker, it runs in the thread pool. It is only kept for this
+        # call, so the content it references does not outlive the save
+        file_saver = FileSaverWorker(file_path, content)
+        
+        # Configure the progress dialog, the same one used for loads. QProgressDialog.setValue
+        # would process events again from inside the dialogue loop for every update
+        save_progress = ProgressDialog(self)
+        save_progress.setWindowTitle(f"Saving {file_name}")
+        save_progress.setLabelText(f"Saving {file_name}...")
+        
+        # Connect signals, queued so the slots run on the GUI thread while the worker keeps writing
+        errors = []
+        queued = Qt.ConnectionType.QueuedConnection
+        file_saver.progress_updated.connect(
+            lambda current: save_progress.updateLineProgress(current, total_lines), queued)
+        file_saver.finished.connect(lambda: save_progress.accept(), queued)
+        file_saver.error.connect(lambda error: errors.append(error), queued)
+        file_saver.error.connect(lambda: save_progress.reject(), queued)
+        
+        # Cancel directly, the worker thread is busy writing and would never run a queued slot
+        save_progress.rejected.connect(file_saver.cancel, Qt.ConnectionType.DirectConnection)
+        
+        # Start the save and wait in the dialogue
+        self.thread_pool.start(file_saver.save_file)
+        save_progress.exec()
+        
+        # Wait for a canceled save to stop writing
+        self.thread_pool.waitForDone()
+        save_progress.deleteLater()
+        
+        if errors:
+            raise OSError(errors[0])
+        # A cancel that arrives after the file was replaced does not undo the save
+        return file_saver.is_saved
+    
     def saveAs(self):
         """Save as a new file"""
         if self.table.total_rows == 0:
@@ -1072,14 +1681,12 @@ class MainWindow(QMainWindow):
         # Determine which file save
         file_options = []
         if self.file1_path:
-            file1_name = os.path.basename(self.file1_path)
-            file_options.append((1, f"File 1 ({file1_name})"))
+            file_options.append((1, f"File 1 ({self.file1_name})"))
         else:
             file_options.append((1, "File 1"))
         
         if self.file2_path:
-            file2_name = os.path.basename(self.file2_path)
-            file_options.append((2, f"File 2 ({file2_name})"))
+            file_options.append((2, f"File 2 ({self.file2_name})"))
         else:
             file_options.append((2, "File 2"))
         
@@ -1113,9 +1720,7 @@ class MainWindow(QMainWindow):
             
             if filepath:
                 try:
-                    content = self.table.getContent(selected_column)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(content))
+                    self.table.writeColumn(selected_column, filepath)
                     
                     QMessageBox.information(
                         self, "Success", 
@@ -1139,10 +1744,7 @@ class MainWindow(QMainWindow):
         
         if confirm == QMessageBox.StandardButton.Yes:
             # Clean the table
-            self.table.setRowCount(0)
-            self.table.file1_content.clear()
-            self.table.file2_content.clear()
-            self.table.total_rows = 0
+            self.table.clearContent()
             
             # Reload files
             if self.file1_path:
@@ -1152,8 +1754,8 @@ class MainWindow(QMainWindow):
                 self.loadFile(2, self.file2_path)
             
             # Clean modified rows
-            self.table.modified_rows.clear()
-            self.updateStats()
+            self.table.clearModified()
+            self.requestStats()
             self.showStatusMessage("Reloaded files")
     
     def searchText(self):
@@ -1177,12 +1779,34 @@ class MainWindow(QMainWindow):
         self.table.highlightSearchResults("")
         self.showStatusMessage("Cleaned search")
     
+    def requestStats(self):
+        """Schedule a statistics refresh, repeated requests before it runs are merged into one"""
+        self.stats_pending = True
+        self.scheduleRefresh()
+    
+    def scheduleRefresh(self):
+        """Schedule the pending statistics and status message for the next event loop pass"""
+        if not self.refresh_scheduled:
+            self.refresh_scheduled = True
+            QTimer.singleShot(0, self.applyPendingRefresh)
+    
+    def applyPendingRefresh(self):
+        """Apply the statistics and the last status message requested since the previous pass"""
+        self.refresh_scheduled = False
+        if self.stats_pending:
+            self.updateStats()
+        if self.pending_status is not None:
+            message, timeout = self.pending_status
+            self.pending_status = None
+            self.statusBar.showMessage(message, timeout)
+    
     def updateStats(self):
         """Update statistics"""
+        self.stats_pending = False
         total_lines = self.table.total_rows
         words_file1 = self.table.countWords(1)
         words_file2 = self.table.countWords(2)
-        modified_lines = len(self.table.modified_rows)
+        modified_lines = self.table.modifiedCount()
         
         self.total_lines_label.setText(str(total_lines))
         self.words1_label.setText(str(words_file1))
@@ -1190,8 +1814,9 @@ class MainWindow(QMainWindow):
         self.modified_lines_label.setText(str(modified_lines))
     
     def showStatusMessage(self, message, timeout=5000):
-        """Show a message in the status bar"""
-        self.statusBar.showMessage(message, timeout)
+        """Show a message in the status bar, along with the next statistics refresh"""
+        self.pending_status = (message, timeout)
+        self.scheduleRefresh()
 
 
 # Specific function for Windows that explicitly establishes the application identifier
@@ -1227,9 +1852,8 @@ if __name__ == '__main__':
             print(f"Created directory: {icon_dir}")
     
     # Establish the application at application level (this affects all windows)
-    if os.path.exists(ICON_PATH):
-        app_icon = QIcon(ICON_PATH)
-        app.setWindowIcon(app_icon)
+    if app_icon() is not None:
+        app.setWindowIcon(app_icon())
         print("Application icon set successfully")
     else:
         print("Could not set application icon - file not found")
@@ -1237,7 +1861,7 @@ if __name__ == '__main__':
     window = MainWindow()
     
     # Explicitly establishes the icon for the main window
-    if os.path.exists(ICON_PATH):
+    if app_icon() is not None:
         # Try to load the icon in multiple ways for greater compatibility
         icon = QIcon()
         icon.addFile(ICON_PATH, QSize(16, 16))